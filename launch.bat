@@ -7,9 +7,11 @@ echo ========================================
 echo.
 
 REM Check if packages need installing
-pip show customtkinter >nul 2>&1
-if %errorlevel% neq 0 (
-    echo First run detected - installing packages...
+set NEED_INSTALL=0
+pip show customtkinter >nul 2>&1 || set NEED_INSTALL=1
+pip show soundfile >nul 2>&1 || set NEED_INSTALL=1
+if %NEED_INSTALL%==1 (
+    echo Missing packages detected - installing...
     echo This may take a few minutes...
     echo.
     pip install -r requirements.txt
@@ -19,7 +21,7 @@ if %errorlevel% neq 0 (
 )
 
 echo Launching Voice Transcriber...
-echo (First transcription downloads the AI model - be patient!)
+echo (First launch downloads the AI model in the background - be patient!)
 echo.
 python recorder.py
 
@@ -5,9 +5,9 @@ Voice Transcriber - A sleek voice recording app with automatic Whisper transcrip
 
 import customtkinter as ctk
 import sounddevice as sd
-import numpy as np
-import scipy.io.wavfile as wav
+import soundfile as sf
 import threading
+import queue
 import time
 import os
 from datetime import datetime
@@ -23,6 +23,15 @@ except ImportError:
     WHISPER_AVAILABLE = False
     WHISPER_MODEL = None
 
+# Try to import WebRTC voice activity detection
+try:
+    import webrtcvad
+    VAD_AVAILABLE = True
+except ImportError:
+    VAD_AVAILABLE = False
+
+WHISPER_MODEL_LOCK = threading.Lock()  # Serializes the lazy model load
+
 # App directories
 APP_DIR = Path(__file__).parent
 RECORDINGS_DIR = APP_DIR / "recordings"
@@ -33,9 +42,77 @@ CONFIG_FILE = APP_DIR / "config.json"
 RECORDINGS_DIR.mkdir(exist_ok=True)
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
 
+# Parsed config.json, loaded on first use and kept in sync by _save_config
+_config_cache = None
+
+
+def _load_config():
+    """Return the parsed config, reading config.json only once"""
+    global _config_cache
+    if _config_cache is None:
+        _config_cache = {}
+        if CONFIG_FILE.exists():
+            try:
+                _config_cache = json.loads(CONFIG_FILE.read_text())
+            except:
+                pass
+    return _config_cache
+
+
+def _save_config():
+    """Write the cached config back to config.json"""
+    with open(CONFIG_FILE, "w") as f:
+        json.dump(_load_config(), f)
+
 # Audio settings
-SAMPLE_RATE = 44100
+SAMPLE_RATE = 16000  # Whisper's native rate, so recordings never need resampling
 CHANNELS = 1
+SAMPLE_WIDTH = 2  # int16
+RING_SECONDS = 10  # Audio the ring can hold before the writer falls behind
+
+# Speech detection settings
+VAD_FRAME_MS = 30
+VAD_MIN_SPEECH_MS = 300  # Below this much voiced audio in total, skip transcription
+VAD_PADDING_MS = 300  # Silence kept around the detected speech
+NO_SPEECH_TEXT = "(no speech detected)"
+
+MODEL_LOADING_TEXT = "Loading Whisper model..."
+
+
+class RingBuffer:
+    """Preallocated single-producer/single-consumer byte ring for the audio callback"""
+    
+    def __init__(self, size):
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._size = size
+        # Running byte counts; only the callback advances _written, only the reader advances _read
+        self._written = 0
+        self._read = 0
+        
+    def write(self, data):
+        """Copy data into the ring with no numpy/bytes copies; returns False if it would overflow"""
+        data = memoryview(data).cast("B")
+        n = len(data)
+        if n > self._size - (self._written - self._read):
+            return False
+        pos = self._written % self._size
+        first = min(n, self._size - pos)
+        self._view[pos:pos + first] = data[:first]
+        self._view[:n - first] = data[first:]
+        self._written += n
+        return True
+        
+    def drain(self, sink):
+        """Pass every unread region to sink, oldest first"""
+        available = self._written - self._read
+        while available:
+            pos = self._read % self._size
+            n = min(available, self._size - pos)
+            sink(self._view[pos:pos + n])
+            self._read += n
+            available -= n
+
 
 class VoiceTranscriber(ctk.CTk):
     def __init__(self):
@@ -52,17 +129,29 @@ class VoiceTranscriber(ctk.CTk):
         
         # State
         self.is_recording = False
-        self.audio_data = []
+        self._stop_event = threading.Event()
+        self.frames_recorded = 0
+        self.audio_gaps = 0
         self.start_time = None
-        self.timer_thread = None
+        self.recording_thread = None
         self.current_filename = None
+        self.audio_path = None
         
         # Load config
         self.api_key = self.load_api_key()
         
+        # UI updates posted from worker threads, applied by _drain_ui on the Tk thread
+        self._ui_queue = queue.SimpleQueue()
+        self._active_workers = 0  # Only touched on the Tk thread
+        self._pump_running = False
+        
         # Build UI
         self.create_widgets()
         
+        # Warm up the Whisper model at startup so the first transcription doesn't pay for it
+        if WHISPER_AVAILABLE:
+            self._start_worker(self.preload_model)
+        
     def load_api_key(self):
         """Load API key from config or environment"""
         # Try environment variable first
@@ -71,27 +160,12 @@ class VoiceTranscriber(ctk.CTk):
             return key
         
         # Try config file
-        if CONFIG_FILE.exists():
-            try:
-                with open(CONFIG_FILE) as f:
-                    config = json.load(f)
-                    return config.get("openai_api_key")
-            except:
-                pass
-        return None
+        return _load_config().get("openai_api_key")
     
     def save_api_key(self, key):
         """Save API key to config"""
-        config = {}
-        if CONFIG_FILE.exists():
-            try:
-                with open(CONFIG_FILE) as f:
-                    config = json.load(f)
-            except:
-                pass
-        config["openai_api_key"] = key
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f)
+        _load_config()["openai_api_key"] = key
+        _save_config()
         self.api_key = key
         
     def create_widgets(self):
@@ -193,6 +267,50 @@ class VoiceTranscriber(ctk.CTk):
         )
         self.settings_button.pack(pady=(20, 0))
         
+    def _post(self, fn):
+        """Queue a UI update from any thread; applied on the next _drain_ui pass"""
+        self._ui_queue.put(fn)
+        
+    def _start_worker(self, target):
+        """Run target on a background thread, pumping its posted UI updates until it finishes"""
+        self._active_workers += 1
+        if not self._pump_running:
+            self._pump_running = True
+            self.after(50, self._drain_ui)
+        
+        def run():
+            try:
+                target()
+            finally:
+                self._post(self._worker_done)
+        
+        threading.Thread(target=run, daemon=True).start()
+        
+    def _worker_done(self):
+        """Posted by a worker as its last update so the pump can stop"""
+        self._active_workers -= 1
+        
+    def _drain_ui(self):
+        """Apply all pending UI updates in one pass; stops once no worker is running"""
+        try:
+            while True:
+                try:
+                    fn = self._ui_queue.get_nowait()
+                except queue.Empty:
+                    break
+                fn()
+        finally:
+            # Keep pumping while a worker may still post, even if an update failed
+            if self._active_workers or not self._ui_queue.empty():
+                self.after(50, self._drain_ui)
+            else:
+                self._pump_running = False
+        
+    def reset_status(self):
+        """Return the idle UI to its ready state"""
+        self.progress_frame.pack_forget()
+        self.status_label.configure(text="Ready")
+        
     def toggle_recording(self):
         if self.is_recording:
             self.stop_recording()
@@ -200,8 +318,15 @@ class VoiceTranscriber(ctk.CTk):
             self.start_recording()
             
     def start_recording(self):
+        # Generate filename up front so audio can stream straight to disk
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.current_filename = f"recording_{timestamp}"
+        self.audio_path = RECORDINGS_DIR / f"{self.current_filename}.wav"
+        
         self.is_recording = True
-        self.audio_data = []
+        self._stop_event.clear()
+        self.frames_recorded = 0
+        self.audio_gaps = 0
         self.start_time = time.time()
         
         # Update UI
@@ -217,12 +342,12 @@ class VoiceTranscriber(ctk.CTk):
         self.recording_thread = threading.Thread(target=self.record_audio, daemon=True)
         self.recording_thread.start()
         
-        # Start timer thread
-        self.timer_thread = threading.Thread(target=self.update_timer, daemon=True)
-        self.timer_thread.start()
+        # Start timer updates on the UI thread
+        self.update_timer()
         
     def stop_recording(self):
         self.is_recording = False
+        self._stop_event.set()
         
         # Update UI
         self.status_canvas.itemconfig(self.status_light, fill="#555555")  # Gray light
@@ -235,117 +360,230 @@ class VoiceTranscriber(ctk.CTk):
         )
         
         # Save and transcribe in background
-        threading.Thread(target=self.save_and_transcribe, daemon=True).start()
+        self._start_worker(self.save_and_transcribe)
         
     def record_audio(self):
-        """Record audio in a separate thread"""
+        """Record audio in a separate thread, draining the callback's ring buffer to disk"""
+        ring = RingBuffer(SAMPLE_RATE * CHANNELS * SAMPLE_WIDTH * RING_SECONDS)
+        overflows = dropped = 0
+        
         def callback(indata, frames, time_info, status):
-            if self.is_recording:
-                self.audio_data.append(indata.copy())
+            # Runs on the PortAudio thread: copy into preallocated memory and return
+            nonlocal overflows, dropped
+            if status.input_overflow:
+                overflows += 1
+            if not self.is_recording:
+                return
+            if ring.write(indata):
+                self.frames_recorded += frames
+            else:
+                dropped += 1
         
-        with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, callback=callback):
-            while self.is_recording:
-                time.sleep(0.1)
+        with sf.SoundFile(
+            str(self.audio_path),
+            mode="w",
+            samplerate=SAMPLE_RATE,
+            channels=CHANNELS,
+            subtype="PCM_16"
+        ) as audio_file:
+            def write_block(block):
+                audio_file.buffer_write(block, dtype="int16")
+            
+            with sd.RawInputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype="int16", callback=callback):
+                # Wake every 100ms to drain, or immediately once stop is requested
+                while not self._stop_event.wait(0.1):
+                    ring.drain(write_block)
+            
+            # Flush whatever arrived before the stream closed
+            ring.drain(write_block)
+        
+        if overflows or dropped:
+            print(f"Warning: recording has gaps ({overflows} input overflows, {dropped} dropped blocks)")
+        self.audio_gaps = overflows + dropped
                 
     def update_timer(self):
-        """Update the timer display"""
-        while self.is_recording:
-            elapsed = time.time() - self.start_time
-            hours = int(elapsed // 3600)
-            minutes = int((elapsed % 3600) // 60)
-            seconds = int(elapsed % 60)
-            self.timer_label.configure(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
-            time.sleep(0.1)
+        """Update the timer display, rescheduling itself on the Tk event loop while recording"""
+        if not self.is_recording:
+            return
+        elapsed = time.time() - self.start_time
+        hours = int(elapsed // 3600)
+        minutes = int((elapsed % 3600) // 60)
+        seconds = int(elapsed % 60)
+        self.timer_label.configure(text=f"{hours:02d}:{minutes:02d}:{seconds:02d}")
+        self.after(100, self.update_timer)
             
     def save_and_transcribe(self):
         """Save the recording and transcribe it"""
         try:
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.current_filename = f"recording_{timestamp}"
-            audio_path = RECORDINGS_DIR / f"{self.current_filename}.wav"
+            audio_path = self.audio_path
             transcript_path = TRANSCRIPTS_DIR / f"{self.current_filename}.txt"
             
-            # Concatenate audio data
-            if not self.audio_data:
-                self.after(0, lambda: self.status_label.configure(text="No audio recorded"))
-                self.after(0, lambda: self.record_button.configure(state="normal"))
-                return
-                
-            audio_array = np.concatenate(self.audio_data, axis=0)
+            # Wait for the stream to close and the WAV header to be finalized
+            self._post(lambda: self.status_label.configure(text="Saving audio..."))
+            self.recording_thread.join()
             
-            # Save WAV file
-            self.after(0, lambda: self.status_label.configure(text="Saving audio..."))
-            wav.write(str(audio_path), SAMPLE_RATE, audio_array)
+            if not self.frames_recorded:
+                audio_path.unlink(missing_ok=True)
+                self._post(lambda: self.status_label.configure(text="No audio recorded"))
+                self._post(lambda: self.record_button.configure(state="normal"))
+                return
             
             # Show progress
-            self.after(0, lambda: self.progress_frame.pack(pady=10, fill="x", padx=20))
-            self.after(0, lambda: self.progress_label.configure(text="Transcribing..."))
-            self.after(0, lambda: self.progress_bar.set(0.1))
+            self._post(lambda: self.progress_frame.pack(pady=10, fill="x", padx=20))
+            self._post(lambda: self.progress_label.configure(text="Transcribing..."))
+            self._post(lambda: self.progress_bar.set(0.1))
+            
+            # Skip Whisper entirely for silent recordings
+            if WHISPER_AVAILABLE:
+                speech_span = self.find_speech(audio_path)
+                if speech_span is None:
+                    self.write_transcript(transcript_path, NO_SPEECH_TEXT)
+                    self._post(lambda: self.progress_bar.set(1.0))
+                    self._post(lambda: self.status_label.configure(text="✓ No speech detected"))
+                    self._post(lambda: self.info_label.configure(
+                        text=f"Saved: {self.current_filename}\nNo speech detected, transcription skipped"
+                    ))
+                    return
+            else:
+                speech_span = (0, None)
             
             # Transcribe
-            transcript = self.transcribe_audio(audio_path)
+            transcript = self.transcribe_audio(audio_path, speech_span)
             
             if transcript:
-                # Save transcript
-                with open(transcript_path, "w") as f:
-                    f.write(f"Recording: {self.current_filename}\n")
-                    f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Duration: {self.timer_label.cget('text')}\n")
-                    f.write("=" * 50 + "\n\n")
-                    f.write(transcript)
+                self.write_transcript(transcript_path, transcript)
                 
-                self.after(0, lambda: self.progress_bar.set(1.0))
-                self.after(0, lambda: self.status_label.configure(text="✓ Done!"))
-                self.after(0, lambda: self.info_label.configure(
-                    text=f"Saved: {self.current_filename}\n{len(transcript)} characters transcribed"
-                ))
+                self._post(lambda: self.progress_bar.set(1.0))
+                self._post(lambda: self.status_label.configure(text="✓ Done!"))
+                info = f"Saved: {self.current_filename}\n{len(transcript)} characters transcribed"
+                if self.audio_gaps:
+                    info += f"\n⚠ {self.audio_gaps} gaps in audio"
+                self._post(lambda: self.info_label.configure(text=info))
             else:
-                self.after(0, lambda: self.status_label.configure(text="Audio saved (no transcription)"))
-                self.after(0, lambda: self.info_label.configure(text=f"Saved: {audio_path.name}"))
+                self._post(lambda: self.status_label.configure(text="Audio saved (no transcription)"))
+                self._post(lambda: self.info_label.configure(text=f"Saved: {audio_path.name}"))
                 
         except Exception as e:
-            self.after(0, lambda: self.status_label.configure(text=f"Error: {str(e)[:30]}"))
+            message = f"Error: {str(e)[:30]}"
+            self._post(lambda: self.status_label.configure(text=message))
             print(f"Error: {e}")
             
         finally:
             # Reset UI
-            self.after(0, lambda: self.record_button.configure(state="normal"))
-            self.after(2000, lambda: self.progress_frame.pack_forget())
-            self.after(2000, lambda: self.status_label.configure(text="Ready"))
+            self._post(lambda: self.record_button.configure(state="normal"))
+            self._post(lambda: self.after(2000, self.reset_status))
             
-    def transcribe_audio(self, audio_path):
-        """Transcribe audio using local Whisper model (free!)"""
-        global WHISPER_MODEL
+    def write_transcript(self, transcript_path, transcript):
+        """Save a transcript with the recording details header"""
+        with open(transcript_path, "w") as f:
+            f.write(f"Recording: {self.current_filename}\n")
+            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"Duration: {self.timer_label.cget('text')}\n")
+            f.write("=" * 50 + "\n\n")
+            f.write(transcript)
+            
+    def find_speech(self, audio_path):
+        """Return the (start, stop) frame range around detected speech, or None if the recording is silent"""
+        if not VAD_AVAILABLE:
+            return 0, None
+        
+        rate = sf.info(str(audio_path)).samplerate
+        block = rate * VAD_FRAME_MS // 1000
+        
+        vad = webrtcvad.Vad(2)
+        first_voiced = last_voiced = None
+        voiced = total = 0
+        for frame in sf.blocks(str(audio_path), blocksize=block, dtype="int16", always_2d=True):
+            if len(frame) < block:
+                break
+            if vad.is_speech(frame[:, 0].tobytes(), rate):
+                if first_voiced is None:
+                    first_voiced = total
+                last_voiced = total
+                voiced += 1
+            total += 1
+        
+        if voiced * VAD_FRAME_MS < VAD_MIN_SPEECH_MS:
+            return None
         
+        # Trim leading/trailing silence so Whisper has less audio to process
+        padding = rate * VAD_PADDING_MS // 1000
+        return max(first_voiced * block - padding, 0), (last_voiced + 1) * block + padding
+        
+    def transcribe_audio(self, audio_path, speech_span=(0, None)):
+        """Transcribe audio using local Whisper model (free!)"""
         if not WHISPER_AVAILABLE:
             print("Whisper not installed. Run: pip install openai-whisper")
-            self.after(0, lambda: self.status_label.configure(text="Install whisper first"))
+            self._post(lambda: self.status_label.configure(text="Install whisper first"))
             return None
             
         try:
-            # Load model if not already loaded (first time takes a bit)
+            # Load model if not already loaded (usually done at startup)
             if WHISPER_MODEL is None:
-                self.after(0, lambda: self.progress_label.configure(text="Loading Whisper model..."))
-                self.after(0, lambda: self.progress_bar.set(0.1))
-                # Using "base" model - good balance of speed/accuracy
-                # Options: tiny, base, small, medium, large
-                WHISPER_MODEL = whisper.load_model("base")
+                self._post(lambda: self.progress_label.configure(text=MODEL_LOADING_TEXT))
+                self._post(lambda: self.progress_bar.set(0.1))
+            self.load_model()
             
-            self.after(0, lambda: self.progress_label.configure(text="Transcribing..."))
-            self.after(0, lambda: self.progress_bar.set(0.3))
+            self._post(lambda: self.progress_label.configure(text="Transcribing..."))
+            self._post(lambda: self.progress_bar.set(0.3))
             
             # Transcribe
-            result = WHISPER_MODEL.transcribe(str(audio_path))
+            result = WHISPER_MODEL.transcribe(self.load_audio(audio_path, speech_span))
             
-            self.after(0, lambda: self.progress_bar.set(0.9))
+            self._post(lambda: self.progress_bar.set(0.9))
             return result["text"]
                 
         except Exception as e:
             print(f"Transcription error: {e}")
-            self.after(0, lambda: self.status_label.configure(text=f"Error: {str(e)[:30]}"))
+            message = f"Error: {str(e)[:30]}"
+            self._post(lambda: self.status_label.configure(text=message))
             return None
         
+    def load_model(self):
+        """Load the Whisper model once; concurrent callers wait for the in-flight load"""
+        global WHISPER_MODEL
+        
+        with WHISPER_MODEL_LOCK:
+            if WHISPER_MODEL is None:
+                # Using "base" model - good balance of speed/accuracy
+                # Options: tiny, base, small, medium, large
+                WHISPER_MODEL = whisper.load_model("base")
+        return WHISPER_MODEL
+        
+    def preload_model(self):
+        """Load the Whisper model in the background; errors resurface when transcribing"""
+        # The first run downloads the model, so make the wait visible
+        self._post(self.show_loading_status)
+        try:
+            self.load_model()
+        except Exception as e:
+            print(f"Whisper preload failed: {e}")
+        finally:
+            self._post(self.clear_loading_status)
+            
+    def show_loading_status(self):
+        """Show the model loading message unless the app is already busy"""
+        if self.status_label.cget("text") == "Ready":
+            self.status_label.configure(text=MODEL_LOADING_TEXT)
+            
+    def clear_loading_status(self):
+        """Restore the idle status unless something else has replaced the loading message"""
+        if self.status_label.cget("text") == MODEL_LOADING_TEXT:
+            self.status_label.configure(text="Ready")
+            
+    def load_audio(self, audio_path, speech_span=(0, None)):
+        """Read the WAV directly as Whisper input, skipping the ffmpeg decode when no resampling is needed"""
+        info = sf.info(str(audio_path))
+        if info.samplerate != whisper.audio.SAMPLE_RATE:
+            # Let Whisper resample the whole file through ffmpeg
+            return str(audio_path)
+        
+        start, stop = speech_span
+        audio, _ = sf.read(str(audio_path), start=start, stop=stop, dtype="float32")
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        return audio
+        
     def open_settings(self):
         """Open settings dialog for API key"""
         dialog = ctk.CTkInputDialog(